@@ -4,13 +4,13 @@ FFC ADP Data Collection Script
 Collects Average Draft Position data from Fantasy Football Calculator API
 """
 
-import json
 import requests
 import pandas as pd
 from datetime import datetime
 import os
 import sys
 import time
+from json_io import load_json, save_json
 
 class ADPDataCollector:
     def __init__(self):
@@ -84,8 +84,7 @@ class ADPDataCollector:
                 
                 # Save individual scoring format file
                 filename = f"{self.data_dir}/adp_{scoring}_{self.current_season}.json"
-                with open(filename, 'w') as f:
-                    json.dump(adp_data, f, indent=2)
+                save_json(filename, adp_data, compact=True)
                     
                 print(f"Saved {scoring} ADP data to {filename}")
             else:
@@ -112,8 +111,7 @@ class ADPDataCollector:
                 
                 # Save position-specific file
                 filename = f"{self.data_dir}/adp_ppr_{position}_{self.current_season}.json"
-                with open(filename, 'w') as f:
-                    json.dump(adp_data, f, indent=2)
+                save_json(filename, adp_data, compact=True)
                     
                 print(f"Saved {position.upper()} ADP data to {filename}")
             else:
@@ -134,13 +132,15 @@ class ADPDataCollector:
                 print("PPR ADP data not found - run collection first")
                 return False
                 
-            with open(ppr_file, 'r') as f:
-                ppr_data = json.load(f)
+            ppr_data = load_json(ppr_file)
+                
+            # One timestamp for the database and every player record in it
+            now_iso = datetime.now().isoformat()
                 
             # Create consolidated database
             consolidated_db = {
                 'meta': {
-                    'created_at': datetime.now().isoformat(),
+                    'created_at': now_iso,
                     'season': self.current_season,
                     'primary_scoring': 'ppr',
                     'total_players': len(ppr_data.get('players', [])),
@@ -171,7 +171,7 @@ class ADPDataCollector:
                         }
                     },
                     'bye_week': player.get('bye', 0),
-                    'last_updated': datetime.now().isoformat()
+                    'last_updated': now_iso
                 }
                 
             # Add standard and half-PPR data if available
@@ -179,8 +179,7 @@ class ADPDataCollector:
                 scoring_file = f"{self.data_dir}/adp_{scoring}_{self.current_season}.json"
                 
                 if os.path.exists(scoring_file):
-                    with open(scoring_file, 'r') as f:
-                        scoring_data = json.load(f)
+                    scoring_data = load_json(scoring_file)
                         
                     for player in scoring_data.get('players', []):
                         player_id = str(player.get('player_id', ''))
@@ -199,8 +198,7 @@ class ADPDataCollector:
                             
             # Save consolidated database
             consolidated_file = f"{self.data_dir}/adp_consolidated_{self.current_season}.json"
-            with open(consolidated_file, 'w') as f:
-                json.dump(consolidated_db, f, indent=2)
+            save_json(consolidated_file, consolidated_db, compact=True)
                 
             print(f"Created consolidated ADP database with {len(consolidated_db['players'])} players")
             return True
@@ -219,20 +217,21 @@ class ADPDataCollector:
                 print("No consolidated ADP data found")
                 return False
                 
-            with open(consolidated_file, 'r') as f:
-                current_data = json.load(f)
+            current_data = load_json(consolidated_file)
                 
+            # One timestamp for this snapshot and every player history entry
+            now_iso = datetime.now().isoformat()
+            
             # Load or create historical tracking
             historical_file = f"{self.data_dir}/adp_historical_tracking_{self.current_season}.json"
             
             if os.path.exists(historical_file):
-                with open(historical_file, 'r') as f:
-                    historical_data = json.load(f)
+                historical_data = load_json(historical_file)
             else:
                 historical_data = {
                     'meta': {
                         'season': self.current_season,
-                        'tracking_started': datetime.now().isoformat()
+                        'tracking_started': now_iso
                     },
                     'snapshots': [],
                     'players': {}
@@ -240,7 +239,7 @@ class ADPDataCollector:
                 
             # Create snapshot of current data
             snapshot = {
-                'date': datetime.now().isoformat(),
+                'date': now_iso,
                 'total_players': len(current_data.get('players', {})),
                 'source_meta': current_data.get('meta', {})
             }
@@ -259,7 +258,7 @@ class ADPDataCollector:
                     
                 # Add current ADP to history
                 adp_entry = {
-                    'date': datetime.now().isoformat(),
+                    'date': now_iso,
                     'ppr_adp': player_data.get('adp', {}).get('ppr', {}).get('adp', 0),
                     'times_drafted': player_data.get('adp', {}).get('ppr', {}).get('times_drafted', 0)
                 }
@@ -267,8 +266,7 @@ class ADPDataCollector:
                 historical_data['players'][player_id]['adp_history'].append(adp_entry)
                 
             # Save updated historical data
-            with open(historical_file, 'w') as f:
-                json.dump(historical_data, f, indent=2)
+            save_json(historical_file, historical_data, compact=True)
                 
             print(f"Updated historical ADP tracking for {len(historical_data['players'])} players")
             return True
@@ -8,7 +8,9 @@ import json
 import pandas as pd
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from json_io import ORJSON_AVAILABLE, load_json, parse_json, save_json
 
 # Handle nfl_data_py import with error handling
 try:
@@ -18,10 +20,60 @@ except ImportError:
     print("Warning: nfl_data_py not available")
     NFL_DATA_AVAILABLE = False
 
+# Compact dtypes applied to collected stat frames before saving
+STAT_DTYPES = {
+    'week': 'int8',
+    'season': 'int16',
+    'games': 'int16',
+    'passing_tds': 'int16',
+    'interceptions': 'int16',
+    'rushing_tds': 'int16',
+    'receiving_tds': 'int16',
+    'receptions': 'int16',
+    'targets': 'int16',
+    'passing_yards': 'float32',
+    'rushing_yards': 'float32',
+    'receiving_yards': 'float32',
+    'fantasy_points': 'float32',
+    'fantasy_points_ppr': 'float32'
+}
+
+# Decimals kept for float stats on output; yardage is whole and fantasy points have at most two,
+# so this drops only float32 noise (8.5799999237 -> 8.58)
+STAT_DECIMALS = 2
+
+# Fantasy-relevant columns kept from nfl_data_py weekly data
+WEEKLY_STAT_COLUMNS = [
+    'player_id', 'player_name', 'player_display_name', 'position',
+    'team', 'week', 'passing_yards', 'passing_tds', 'interceptions',
+    'rushing_yards', 'rushing_tds', 'receiving_yards', 'receiving_tds',
+    'receptions', 'targets', 'fantasy_points', 'fantasy_points_ppr'
+]
+
+# Fantasy-relevant columns kept from nfl_data_py seasonal data
+SEASON_STAT_COLUMNS = [
+    'player_id', 'player_name', 'player_display_name', 'position',
+    'team', 'games', 'passing_yards', 'passing_tds', 'interceptions',
+    'rushing_yards', 'rushing_tds', 'receiving_yards', 'receiving_tds',
+    'receptions', 'targets', 'fantasy_points', 'fantasy_points_ppr'
+]
+
+# Per-week stats kept in the consolidated performance file, plus the TD columns summed into total_tds
+CONSOLIDATED_STAT_COLUMNS = [
+    'fantasy_points', 'fantasy_points_ppr', 'passing_yards',
+    'rushing_yards', 'receiving_yards'
+]
+TD_COLUMNS = ['passing_tds', 'rushing_tds', 'receiving_tds']
+
+# Low-cardinality label columns stored as categoricals in collected stat frames
+CATEGORY_COLUMNS = ['position', 'team']
+
 class NFLDataCollector:
     def __init__(self):
         self.data_dir = "data"
         self.current_season = 2025
+        self.weekly_data = {}
+        self.current_week = None
         self.ensure_directories()
         
     def ensure_directories(self):
@@ -30,16 +82,77 @@ class NFLDataCollector:
         
     def get_current_week(self):
         """Determine current NFL week based on date"""
+        # Work the week out once per run so every step agrees on it
+        if self.current_week is not None:
+            return self.current_week
+            
         # NFL season typically starts first Thursday after Labor Day
         season_start = datetime(2025, 9, 5)  # Adjust for actual 2025 season start
         current_date = datetime.now()
         
         if current_date < season_start:
-            return 0  # Preseason
+            self.current_week = 0  # Preseason
+            return self.current_week
         
         days_since_start = (current_date - season_start).days
-        week = min((days_since_start // 7) + 1, 18)
-        return week
+        self.current_week = min((days_since_start // 7) + 1, 18)
+        return self.current_week
+        
+    def coerce_stat_columns(self, stats):
+        """Convert stat columns to compact dtypes column-wise, filling numeric gaps with 0"""
+        stats = stats.copy()
+        
+        dtypes = {col: dtype for col, dtype in STAT_DTYPES.items() if col in stats.columns}
+        if dtypes:
+            columns = list(dtypes)
+            numeric = stats[columns].apply(pd.to_numeric, errors='coerce').fillna(0)
+            stats[columns] = numeric.astype(dtypes)
+            
+        for col in CATEGORY_COLUMNS:
+            if col in stats.columns:
+                stats[col] = stats[col].astype('category')
+                
+        return stats
+        
+    def round_float_columns(self, frame):
+        """Round float stat columns for output"""
+        # Widen to float64 first so float32 noise never reaches the JSON
+        float_columns = frame.select_dtypes('floating').columns
+        if len(float_columns) == 0:
+            return frame
+            
+        return frame.assign(**{col: frame[col].astype('float64').round(STAT_DECIMALS) for col in float_columns})
+        
+    def save_records(self, frame, path):
+        """Save a frame as compact JSON records"""
+        # These files are machine-read; without orjson let pandas round and write them
+        if not ORJSON_AVAILABLE:
+            temp_file = f"{path}.tmp"
+            try:
+                frame.to_json(temp_file, orient='records', double_precision=STAT_DECIMALS, force_ascii=False)
+                os.replace(temp_file, path)
+            except BaseException:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+                raise
+            return
+            
+        save_json(path, self.round_float_columns(frame).to_dict(orient='records'), compact=True)
+            
+    def load_weekly_data(self, season):
+        """Load weekly data for a season, reusing this run's download"""
+        if season in self.weekly_data:
+            return self.weekly_data[season]
+            
+        weekly_stats = nfl.import_weekly_data([season])
+        
+        # Drop unused columns up front so the memo only holds what is saved
+        projected_columns = [col for col in WEEKLY_STAT_COLUMNS if col in weekly_stats.columns]
+        if projected_columns:
+            weekly_stats = weekly_stats[projected_columns]
+        self.weekly_data[season] = weekly_stats
+        
+        return weekly_stats
         
     def collect_weekly_stats(self, week=None):
         """Collect weekly player statistics with error handling"""
@@ -59,47 +172,39 @@ class NFLDataCollector:
             
             # Try current season first, fall back to previous season for testing
             try:
-                weekly_stats = nfl.import_weekly_data([self.current_season])
+                weekly_stats = self.load_weekly_data(self.current_season)
                 print(f"Successfully loaded {self.current_season} weekly data")
             except Exception as e:
                 print(f"Error loading {self.current_season} data: {e}")
                 print("Falling back to 2024 data for testing...")
-                weekly_stats = nfl.import_weekly_data([2024])
+                weekly_stats = self.load_weekly_data(2024)
                 
             if weekly_stats.empty:
                 print(f"No weekly data available yet")
                 return None
                 
-            # Filter for current week if available
+            # Keep only available fantasy-relevant columns
+            available_columns = [col for col in WEEKLY_STAT_COLUMNS if col in weekly_stats.columns]
+            if not available_columns:
+                # Fallback with basic columns
+                basic_columns = ['player_name', 'position', 'team']
+                available_columns = [col for col in basic_columns if col in weekly_stats.columns]
+                available_columns = available_columns or list(weekly_stats.columns)
+                
+            # Filter for current week if available, selecting the columns in the same slice
             if 'week' in weekly_stats.columns:
-                current_week_stats = weekly_stats[weekly_stats['week'] == week]
-                if current_week_stats.empty:
+                filtered_stats = weekly_stats.loc[weekly_stats['week'] == week, available_columns]
+                if filtered_stats.empty:
                     print(f"No data available for Week {week} yet")
                     return None
             else:
-                current_week_stats = weekly_stats
+                filtered_stats = weekly_stats[available_columns]
                 
-            # Focus on fantasy-relevant stats
-            fantasy_columns = [
-                'player_id', 'player_name', 'player_display_name', 'position', 
-                'team', 'week', 'passing_yards', 'passing_tds', 'interceptions',
-                'rushing_yards', 'rushing_tds', 'receiving_yards', 'receiving_tds',
-                'receptions', 'targets', 'fantasy_points', 'fantasy_points_ppr'
-            ]
-            
-            # Keep only available columns
-            available_columns = [col for col in fantasy_columns if col in current_week_stats.columns]
-            if available_columns:
-                filtered_stats = current_week_stats[available_columns]
-            else:
-                # Fallback with basic columns
-                basic_columns = ['player_name', 'position', 'team']
-                available_basic = [col for col in basic_columns if col in current_week_stats.columns]
-                filtered_stats = current_week_stats[available_basic] if available_basic else current_week_stats
+            filtered_stats = self.coerce_stat_columns(filtered_stats)
             
             # Save weekly data
             week_file = f"{self.data_dir}/week_{week}_stats_{self.current_season}.json"
-            filtered_stats.to_json(week_file, orient='records', indent=2)
+            self.save_records(filtered_stats, week_file)
             
             print(f"Saved {len(filtered_stats)} player records for Week {week}")
             return filtered_stats
@@ -130,16 +235,8 @@ class NFLDataCollector:
                 print("No season data available yet")
                 return None
             
-            # Focus on fantasy-relevant stats
-            fantasy_columns = [
-                'player_id', 'player_name', 'player_display_name', 'position',
-                'team', 'games', 'passing_yards', 'passing_tds', 'interceptions',
-                'rushing_yards', 'rushing_tds', 'receiving_yards', 'receiving_tds',
-                'receptions', 'targets', 'fantasy_points', 'fantasy_points_ppr'
-            ]
-            
-            # Keep only available columns
-            available_columns = [col for col in fantasy_columns if col in season_stats.columns]
+            # Keep only available fantasy-relevant columns
+            available_columns = [col for col in SEASON_STAT_COLUMNS if col in season_stats.columns]
             if available_columns:
                 filtered_stats = season_stats[available_columns]
             else:
@@ -147,10 +244,12 @@ class NFLDataCollector:
                 basic_columns = ['player_name', 'position', 'team']
                 available_basic = [col for col in basic_columns if col in season_stats.columns]
                 filtered_stats = season_stats[available_basic] if available_basic else season_stats
+                
+            filtered_stats = self.coerce_stat_columns(filtered_stats)
             
             # Save season data
             season_file = f"{self.data_dir}/season_{self.current_season}_stats.json"
-            filtered_stats.to_json(season_file, orient='records', indent=2)
+            self.save_records(filtered_stats, season_file)
             
             print(f"Saved {len(filtered_stats)} player season records")
             return filtered_stats
@@ -199,11 +298,11 @@ class NFLDataCollector:
                 {"team_abbr": "WAS", "team_name": "Washington Commanders"}
             ]
             
-            teams_df = pd.DataFrame(basic_teams)
+            # The static table is already a list of records, so write it without a DataFrame
             team_file = f"{self.data_dir}/teams_{self.current_season}.json"
-            teams_df.to_json(team_file, orient='records', indent=2)
+            save_json(team_file, basic_teams, compact=True)
             print(f"Saved {len(basic_teams)} team records (basic data)")
-            return teams_df
+            return basic_teams
             
         try:
             print("Collecting team data...")
@@ -212,7 +311,7 @@ class NFLDataCollector:
             
             # Save team data
             team_file = f"{self.data_dir}/teams_{self.current_season}.json"
-            teams.to_json(team_file, orient='records', indent=2)
+            self.save_records(teams, team_file)
             
             print(f"Saved {len(teams)} team records")
             return teams
@@ -222,7 +321,38 @@ class NFLDataCollector:
             # Fall back to basic team data
             return self.collect_team_data()
             
-    def update_consolidated_data(self):
+    def build_weekly_performances(self, week_stats):
+        """Yield (player_id, player_info, week_performance) for each player in a week's stats frame"""
+        if week_stats.empty:
+            return
+            
+        # Fall back to a slug of the player name where the id is missing
+        names = week_stats['player_name'] if 'player_name' in week_stats.columns else pd.Series('', index=week_stats.index)
+        name_ids = names.fillna('').astype(str).str.replace(' ', '_').str.lower()
+        if 'player_id' in week_stats.columns:
+            player_ids = week_stats['player_id'].astype(object)
+            player_ids = player_ids.where(player_ids.notna() & (player_ids != ''), name_ids)
+        else:
+            player_ids = name_ids
+            
+        # Missing label columns read as '', missing stat columns as 0
+        player_info = week_stats.reindex(columns=['player_name', 'position', 'team'], fill_value='').astype(object)
+        player_info = player_info.where(player_info.notna(), None)
+        stats = week_stats.reindex(columns=CONSOLIDATED_STAT_COLUMNS + TD_COLUMNS, fill_value=0)
+        
+        performances = stats[CONSOLIDATED_STAT_COLUMNS].copy()
+        performances['total_tds'] = stats[TD_COLUMNS].sum(axis=1)
+        
+        # Round float32 stats as the week file stores them, so in-memory frames match it
+        performances = self.round_float_columns(performances)
+        
+        for player_id, info, performance in zip(player_ids.tolist(),
+                                                player_info.to_dict('records'),
+                                                performances.to_dict('records')):
+            if player_id:
+                yield player_id, info, performance
+                
+    def update_consolidated_data(self, week_stats=None):
         """Update consolidated performance database with error handling"""
         try:
             # Load existing consolidated data
@@ -230,10 +360,10 @@ class NFLDataCollector:
             
             if os.path.exists(consolidated_file):
                 try:
-                    with open(consolidated_file, 'r') as f:
+                    with open(consolidated_file, 'rb') as f:
                         content = f.read().strip()
                         if content:
-                            consolidated_data = json.loads(content)
+                            consolidated_data = parse_json(content)
                         else:
                             consolidated_data = {}
                 except (json.JSONDecodeError, ValueError):
@@ -248,47 +378,36 @@ class NFLDataCollector:
             if current_week == 0:
                 print("Preseason - no performance data to consolidate")
                 # Ensure file exists with empty structure
-                with open(consolidated_file, 'w') as f:
-                    json.dump({}, f, indent=2)
+                save_json(consolidated_file, {})
                 return
                 
-            # Add weekly data if available
+            # Add weekly data if available, reading the week file only when no frame was passed in
             week_file = f"{self.data_dir}/week_{current_week}_stats_{self.current_season}.json"
-            if os.path.exists(week_file):
+            if week_stats is None and os.path.exists(week_file):
                 try:
-                    with open(week_file, 'r') as f:
-                        week_data = json.load(f)
-                        
-                    # Update consolidated data with weekly performance
-                    for player in week_data:
-                        player_id = player.get('player_id') or player.get('player_name', '').replace(' ', '_').lower()
-                        
-                        if player_id:
-                            if player_id not in consolidated_data:
-                                consolidated_data[player_id] = {
-                                    'player_name': player.get('player_name', ''),
-                                    'position': player.get('position', ''),
-                                    'team': player.get('team', ''),
-                                    'weekly_performances': {}
-                                }
-                            
-                            # Add this week's performance
-                            consolidated_data[player_id]['weekly_performances'][str(current_week)] = {
-                                'fantasy_points': player.get('fantasy_points', 0),
-                                'fantasy_points_ppr': player.get('fantasy_points_ppr', 0),
-                                'passing_yards': player.get('passing_yards', 0),
-                                'rushing_yards': player.get('rushing_yards', 0),
-                                'receiving_yards': player.get('receiving_yards', 0),
-                                'total_tds': (player.get('passing_tds', 0) + 
-                                            player.get('rushing_tds', 0) + 
-                                            player.get('receiving_tds', 0))
-                            }
+                    week_stats = pd.DataFrame(load_json(week_file))
                 except json.JSONDecodeError:
                     print(f"Error reading week {current_week} data file")
+                    
+            if week_stats is not None:
+                week_key = str(current_week)
+                
+                # Update consolidated data with weekly performance, with one lookup per player
+                for player_id, player_info, week_performance in self.build_weekly_performances(week_stats):
+                    player_entry = consolidated_data.get(player_id)
+                    if player_entry is None:
+                        player_entry = consolidated_data[player_id] = {
+                            'player_name': player_info['player_name'],
+                            'position': player_info['position'],
+                            'team': player_info['team'],
+                            'weekly_performances': {}
+                        }
                         
-            # Save updated consolidated data
-            with open(consolidated_file, 'w') as f:
-                json.dump(consolidated_data, f, indent=2)
+                    # Add this week's performance
+                    player_entry['weekly_performances'][week_key] = week_performance
+                        
+            # Save updated consolidated data compactly, as the performance tracker writes this same file
+            save_json(consolidated_file, consolidated_data, compact=True)
                 
             print(f"Updated consolidated data with Week {current_week} performances")
             
@@ -296,8 +415,7 @@ class NFLDataCollector:
             print(f"Error updating consolidated data: {e}")
             # Ensure file exists with basic structure
             consolidated_file = f"{self.data_dir}/season_{self.current_season}_performances.json"
-            with open(consolidated_file, 'w') as f:
-                json.dump({}, f, indent=2)
+            save_json(consolidated_file, {})
 
 def main():
     """Main execution function"""
@@ -305,13 +423,18 @@ def main():
     
     print("Starting NFL data collection...")
     
-    # Collect all data types
-    weekly_stats = collector.collect_weekly_stats()
-    season_stats = collector.collect_season_stats()
-    team_data = collector.collect_team_data()
+    # Collect all data types; the three downloads are independent, so overlap them
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        weekly_future = executor.submit(collector.collect_weekly_stats)
+        season_future = executor.submit(collector.collect_season_stats)
+        team_future = executor.submit(collector.collect_team_data)
+        
+        weekly_stats = weekly_future.result()
+        season_stats = season_future.result()
+        team_data = team_future.result()
     
-    # Update consolidated database
-    collector.update_consolidated_data()
+    # Update consolidated database from the weekly frame already in memory
+    collector.update_consolidated_data(weekly_stats)
     
     print("NFL data collection completed!")
     
@@ -4,20 +4,23 @@ Enhanced Draft Database Generator
 Combines Sleeper player database with FFC ADP data for comprehensive draft analysis
 """
 
-import json
 import pandas as pd
 from datetime import datetime
+from operator import itemgetter
 import os
 import sys
+from json_io import FANTASY_POSITIONS, iter_json_items, load_json, save_json
 
 class DraftDatabaseGenerator:
     def __init__(self):
         self.data_dir = "data"
         self.current_season = 2025
         self.output_file = f"{self.data_dir}/draft_database_{self.current_season}.json"
+        self.total_sleeper_players = 0
+        self.draft_database = None
         
     def load_sleeper_players(self):
-        """Load Sleeper player database"""
+        """Load fantasy-position players from the Sleeper player database"""
         try:
             sleeper_file = f"{self.data_dir}/players.json"
             
@@ -25,10 +28,21 @@ class DraftDatabaseGenerator:
                 print("Sleeper players file not found")
                 return {}
                 
-            with open(sleeper_file, 'r') as f:
-                sleeper_data = json.load(f)
+            # Keep only fantasy positions while parsing so the rest is never retained
+            sleeper_data = {}
+            self.total_sleeper_players = 0
+            
+            for player_id, player in iter_json_items(sleeper_file):
+                self.total_sleeper_players += 1
                 
-            print(f"Loaded {len(sleeper_data)} players from Sleeper database")
+                if not isinstance(player, dict):
+                    continue
+                    
+                if (player.get('position') or '').strip().upper() in FANTASY_POSITIONS:
+                    sleeper_data[player_id] = player
+                    
+            print(f"Loaded {len(sleeper_data)} fantasy players from Sleeper database "
+                  f"({self.total_sleeper_players} total)")
             return sleeper_data
             
         except Exception as e:
@@ -44,8 +58,7 @@ class DraftDatabaseGenerator:
                 print("Consolidated ADP data not found")
                 return {}
                 
-            with open(adp_file, 'r') as f:
-                adp_data = json.load(f)
+            adp_data = load_json(adp_file)
                 
             players_adp = adp_data.get('players', {})
             print(f"Loaded ADP data for {len(players_adp)} players")
@@ -55,6 +68,33 @@ class DraftDatabaseGenerator:
             print(f"Error loading ADP data: {e}")
             return {}
             
+    def create_name_position_index(self, adp_lookup):
+        """Index ADP entries by (name, position), keeping the first entry across teams"""
+        name_position_index = {}
+        for (name, team, position), adp_info in adp_lookup.items():
+            name_position_index.setdefault((name, position), adp_info)
+            
+        return name_position_index
+        
+    def find_team_agnostic_match(self, name_position_index, sleeper_name, sleeper_pos):
+        """Find an ADP entry for a name variant at this position on any team"""
+        # Try name variations for common mismatches (deduplicated so no scan runs twice)
+        name_variants = dict.fromkeys([
+            sleeper_name.replace(' jr.', '').replace(' sr.', '').replace(' iii', '').replace(' ii', ''),
+            sleeper_name.replace('.', ''),
+            sleeper_name.replace("'", "")
+        ])
+        pos_checks = dict.fromkeys([sleeper_pos, 'DEF' if sleeper_pos == 'DST' else sleeper_pos])
+        
+        # Try team-agnostic match (for recent trades)
+        for variant in name_variants:
+            for pos_check in pos_checks:
+                adp_info = name_position_index.get((variant, pos_check))
+                if adp_info:
+                    return adp_info
+                    
+        return None
+        
     def create_player_mapping(self, sleeper_data, adp_data):
         """Create mapping between Sleeper and FFC players"""
         mapping = {}
@@ -67,11 +107,13 @@ class DraftDatabaseGenerator:
             team = player_data.get('team', '').strip().upper()
             position = player_data.get('position', '').strip().upper()
             
-            key = f"{name}|{team}|{position}"
-            adp_lookup[key] = {
+            adp_lookup[(name, team, position)] = {
                 'ffc_id': ffc_id,
                 'data': player_data
             }
+        
+        # Team-agnostic index so the trade fallback is a lookup rather than a scan
+        name_position_index = self.create_name_position_index(adp_lookup)
             
         # Match Sleeper players to ADP data
         for sleeper_id, sleeper_player in sleeper_data.items():
@@ -83,37 +125,24 @@ class DraftDatabaseGenerator:
             sleeper_pos = sleeper_player.get('position', '').strip().upper()
             
             # Skip non-fantasy positions
-            if sleeper_pos not in ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']:
+            if sleeper_pos not in FANTASY_POSITIONS:
                 continue
                 
             # Try exact match first
-            lookup_key = f"{sleeper_name}|{sleeper_team}|{sleeper_pos}"
+            exact_match = adp_lookup.get((sleeper_name, sleeper_team, sleeper_pos))
             
-            if lookup_key in adp_lookup:
-                mapping[sleeper_id] = adp_lookup[lookup_key]
+            if exact_match:
+                mapping[sleeper_id] = exact_match
                 matched_count += 1
                 continue
                 
-            # Try name variations for common mismatches
-            name_variants = [
-                sleeper_name.replace(' jr.', '').replace(' sr.', '').replace(' iii', '').replace(' ii', ''),
-                sleeper_name.replace('.', ''),
-                sleeper_name.replace("'", "")
-            ]
-            
-            # Try team-agnostic match (for recent trades)
-            for variant in name_variants:
-                for pos_check in [sleeper_pos, 'DEF' if sleeper_pos == 'DST' else sleeper_pos]:
-                    # Check all teams for this name/position combo
-                    for key, adp_info in adp_lookup.items():
-                        if key.startswith(f"{variant}|") and key.endswith(f"|{pos_check}"):
-                            mapping[sleeper_id] = adp_info
-                            matched_count += 1
-                            break
-                    if sleeper_id in mapping:
-                        break
-                if sleeper_id in mapping:
-                    break
+            fallback_match = self.find_team_agnostic_match(
+                name_position_index, sleeper_name, sleeper_pos
+            )
+            
+            if fallback_match:
+                mapping[sleeper_id] = fallback_match
+                matched_count += 1
                     
         print(f"Matched {matched_count} players between Sleeper and ADP data")
         return mapping
@@ -134,12 +163,15 @@ class DraftDatabaseGenerator:
             # Create player mapping
             player_mapping = self.create_player_mapping(sleeper_data, adp_data)
             
+            # One timestamp for the whole run
+            now_iso = datetime.now().isoformat()
+            
             # Build comprehensive draft database
             draft_database = {
                 'meta': {
-                    'generated_at': datetime.now().isoformat(),
+                    'generated_at': now_iso,
                     'season': self.current_season,
-                    'total_sleeper_players': len(sleeper_data),
+                    'total_sleeper_players': self.total_sleeper_players,
                     'total_adp_players': len(adp_data),
                     'matched_players': len(player_mapping),
                     'match_rate': round(len(player_mapping) / len(adp_data) * 100, 2)
@@ -173,20 +205,16 @@ class DraftDatabaseGenerator:
                     'bye_week': adp_player.get('bye_week', 0),
                     'adp_data': adp_player.get('adp', {}),
                     'draft_analysis': self.calculate_draft_analysis(adp_player),
-                    'last_updated': datetime.now().isoformat()
+                    'last_updated': now_iso
                 }
                 
                 draft_database['players'][sleeper_id] = player_record
                 
             # Add ADP-only players (not in Sleeper database)
+            matched_ffc_ids = {mapping['ffc_id'] for mapping in player_mapping.values()}
+            
             for ffc_id, adp_player in adp_data.items():
-                # Check if already matched
-                already_matched = any(
-                    mapping['ffc_id'] == ffc_id 
-                    for mapping in player_mapping.values()
-                )
-                
-                if not already_matched:
+                if ffc_id not in matched_ffc_ids:
                     # Create record for ADP-only player
                     player_record = {
                         'sleeper_id': None,
@@ -198,15 +226,15 @@ class DraftDatabaseGenerator:
                         'adp_data': adp_player.get('adp', {}),
                         'draft_analysis': self.calculate_draft_analysis(adp_player),
                         'data_source': 'ffc_only',
-                        'last_updated': datetime.now().isoformat()
+                        'last_updated': now_iso
                     }
                     
                     # Use FFC ID as key for unmatched players
                     draft_database['players'][f"ffc_{ffc_id}"] = player_record
                     
             # Save draft database
-            with open(self.output_file, 'w') as f:
-                json.dump(draft_database, f, indent=2)
+            save_json(self.output_file, draft_database)
+            self.draft_database = draft_database
                 
             print(f"Generated draft database with {len(draft_database['players'])} total players")
             print(f"Match rate: {draft_database['meta']['match_rate']}%")
@@ -309,13 +337,14 @@ class DraftDatabaseGenerator:
     def create_position_rankings(self):
         """Create position-specific rankings and tiers"""
         try:
-            # Load draft database
-            if not os.path.exists(self.output_file):
+            # Reuse the database just generated instead of re-reading it
+            if self.draft_database is not None:
+                draft_db = self.draft_database
+            elif not os.path.exists(self.output_file):
                 print("Draft database not found - run generation first")
                 return False
-                
-            with open(self.output_file, 'r') as f:
-                draft_db = json.load(f)
+            else:
+                draft_db = load_json(self.output_file)
                 
             players = draft_db.get('players', {})
             
@@ -341,17 +370,16 @@ class DraftDatabaseGenerator:
                 })
                 
             # Sort each position by ADP
-            for position in position_rankings:
-                position_rankings[position].sort(key=lambda x: x['adp'])
+            for position_players in position_rankings.values():
+                position_players.sort(key=itemgetter('adp'))
                 
                 # Add position rank
-                for i, player in enumerate(position_rankings[position], 1):
+                for i, player in enumerate(position_players, 1):
                     player['position_rank'] = i
                     
             # Save position rankings
             rankings_file = f"{self.data_dir}/position_rankings_{self.current_season}.json"
-            with open(rankings_file, 'w') as f:
-                json.dump(position_rankings, f, indent=2)
+            save_json(rankings_file, position_rankings)
                 
             print(f"Created position rankings for {len(position_rankings)} positions")
             return True
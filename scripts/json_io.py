@@ -0,0 +1,71 @@
+"""
+Shared JSON helpers for the data collection scripts
+Uses orjson and ijson when available and writes files atomically via a temp file
+"""
+
+import json
+import os
+
+# Handle optional orjson import for faster JSON parsing and writing
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Handle optional ijson import for streaming large JSON objects
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+FANTASY_POSITIONS = frozenset(['QB', 'RB', 'WR', 'TE', 'K', 'DEF'])
+
+def parse_json(content):
+    """Parse JSON bytes or text, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Let the stdlib parser handle NaN/Infinity or raise its usual error
+            pass
+    return json.loads(content)
+
+def load_json(path):
+    """Read and parse a JSON file"""
+    with open(path, 'rb') as f:
+        return parse_json(f.read())
+
+def iter_json_items(path):
+    """Yield the items of a top-level JSON object"""
+    # Stream with ijson when available so large files are never parsed whole
+    if IJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            yield from ijson.kvitems(f, '', use_float=True)
+    else:
+        yield from load_json(path).items()
+
+def save_json(path, data, compact=False):
+    """Write JSON, indented or compact"""
+    # Write beside the target and rename over it so readers never see a partial file
+    temp_file = f"{path}.tmp"
+    try:
+        if ORJSON_AVAILABLE:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            if not compact:
+                option |= orjson.OPT_INDENT_2
+            with open(temp_file, 'wb') as f:
+                f.write(orjson.dumps(data, option=option))
+        else:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                if compact:
+                    json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                else:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, path)
+    except BaseException:
+        # Don't leave a half-written temp file beside the target
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
@@ -4,18 +4,21 @@ Enhanced Recap Content Generator
 Generates AI-powered fantasy football content using ADP and performance data
 """
 
-import json
 import pandas as pd
 from datetime import datetime, timedelta
 import os
 import sys
 import statistics
+import heapq
+from operator import itemgetter
+from json_io import load_json, save_json
 
 class RecapContentGenerator:
     def __init__(self):
         self.data_dir = "data"
         self.current_season = 2025
         self.content_dir = f"{self.data_dir}/generated_content"
+        self.draft_players = None
         self.ensure_directories()
         
     def ensure_directories(self):
@@ -23,7 +26,10 @@ class RecapContentGenerator:
         os.makedirs(self.content_dir, exist_ok=True)
         
     def load_draft_database(self):
-        """Load comprehensive draft database"""
+        """Load comprehensive draft database, parsing it once per generator"""
+        if self.draft_players is not None:
+            return self.draft_players
+            
         try:
             draft_file = f"{self.data_dir}/draft_database_{self.current_season}.json"
             
@@ -31,10 +37,10 @@ class RecapContentGenerator:
                 print("Draft database not found")
                 return {}
                 
-            with open(draft_file, 'r') as f:
-                draft_data = json.load(f)
+            draft_data = load_json(draft_file)
+            self.draft_players = draft_data.get('players', {})
                 
-            return draft_data.get('players', {})
+            return self.draft_players
             
         except Exception as e:
             print(f"Error loading draft database: {e}")
@@ -49,8 +55,7 @@ class RecapContentGenerator:
                 print("Performance data not found")
                 return {}
                 
-            with open(performance_file, 'r') as f:
-                performance_data = json.load(f)
+            performance_data = load_json(performance_file)
                 
             return performance_data
             
@@ -67,8 +72,7 @@ class RecapContentGenerator:
                 print("Historical ADP data not found")
                 return {}
                 
-            with open(historical_file, 'r') as f:
-                historical_data = json.load(f)
+            historical_data = load_json(historical_file)
                 
             return historical_data
             
@@ -179,20 +183,19 @@ class RecapContentGenerator:
                 volatility_analysis['position_volatility'][position]['volatility_rank'] = rank
                 
             # Sort high volatility and stable picks
-            volatility_analysis['high_volatility_players'].sort(key=lambda x: x['stdev'], reverse=True)
-            volatility_analysis['stable_picks'].sort(key=lambda x: x['stdev'])
+            volatility_analysis['high_volatility_players'].sort(key=itemgetter('stdev'), reverse=True)
+            volatility_analysis['stable_picks'].sort(key=itemgetter('stdev'))
             
             # Generate content
             content = self.format_volatility_content(volatility_analysis)
             
             # Save analysis
             output_file = f"{self.content_dir}/adp_volatility_analysis.json"
-            with open(output_file, 'w') as f:
-                json.dump({
-                    'generated_at': datetime.now().isoformat(),
-                    'analysis': volatility_analysis,
-                    'content': content
-                }, f, indent=2)
+            save_json(output_file, {
+                'generated_at': datetime.now().isoformat(),
+                'analysis': volatility_analysis,
+                'content': content
+            })
                 
             print(f"Generated ADP volatility analysis: {len(volatility_analysis['high_volatility_players'])} volatile players")
             return content
@@ -236,15 +239,12 @@ class RecapContentGenerator:
                 f"with only {most_stable['stdev']} pick standard deviation"
             )
             
-        # Position volatility insight
-        sorted_pos = sorted(
-            analysis['position_volatility'].items(),
-            key=lambda x: x[1]['avg_stdev'],
-            reverse=True
-        )
-        
-        if sorted_pos:
-            most_volatile_pos = sorted_pos[0]
+        # Position volatility insight - only the most volatile position is needed, so no full sort
+        if analysis['position_volatility']:
+            most_volatile_pos = max(
+                analysis['position_volatility'].items(),
+                key=lambda x: x[1]['avg_stdev']
+            )
             content['key_insights'].append(
                 f"{most_volatile_pos[0]} is the most volatile position "
                 f"({most_volatile_pos[1]['avg_stdev']} avg standard deviation)"
@@ -281,7 +281,7 @@ class RecapContentGenerator:
             if not draft_db:
                 return None
                 
-            # Analyze position distribution by rounds
+            # Analyze position distribution by rounds; only counts and early-round ADPs are used downstream
             position_by_round = {}
             early_round_positions = {}
             
@@ -299,26 +299,15 @@ class RecapContentGenerator:
                 if draft_round not in position_by_round:
                     position_by_round[draft_round] = {}
                     
-                if position not in position_by_round[draft_round]:
-                    position_by_round[draft_round][position] = []
-                    
-                position_by_round[draft_round][position].append({
-                    'name': player_data.get('name', ''),
-                    'adp': adp,
-                    'team': player_data.get('team', '')
-                })
+                round_positions = position_by_round[draft_round]
+                round_positions[position] = round_positions.get(position, 0) + 1
                 
                 # Track early round positions (first 5 rounds)
                 if draft_round <= 5:
                     if position not in early_round_positions:
                         early_round_positions[position] = []
                         
-                    early_round_positions[position].append({
-                        'name': player_data.get('name', ''),
-                        'adp': adp,
-                        'round': draft_round,
-                        'team': player_data.get('team', '')
-                    })
+                    early_round_positions[position].append(adp)
                     
             # Calculate scarcity metrics
             scarcity_analysis = {
@@ -329,28 +318,29 @@ class RecapContentGenerator:
             }
             
             # Position depth analysis
-            for position, players in early_round_positions.items():
-                players_sorted = sorted(players, key=lambda x: x['adp'])
+            for position, adps in early_round_positions.items():
+                # Only the five earliest picks are used, so avoid sorting the whole position
+                top_5 = heapq.nsmallest(5, adps)
                 
                 scarcity_analysis['position_depth'][position] = {
-                    'early_round_count': len(players),
-                    'first_player_adp': players_sorted[0]['adp'] if players_sorted else 999,
-                    'top_5_adps': [p['adp'] for p in players_sorted[:5]],
-                    'avg_early_adp': round(statistics.mean([p['adp'] for p in players]), 1) if players else 0
+                    'early_round_count': len(adps),
+                    'first_player_adp': top_5[0] if top_5 else 999,
+                    'top_5_adps': top_5,
+                    'avg_early_adp': round(statistics.mean(adps), 1) if adps else 0
                 }
                 
             # Round composition
             for round_num, positions in position_by_round.items():
-                total_players = sum(len(players) for players in positions.values())
+                total_players = sum(positions.values())
                 
                 scarcity_analysis['round_composition'][round_num] = {
                     'total_players': total_players,
                     'position_breakdown': {
                         pos: {
-                            'count': len(players),
-                            'percentage': round(len(players) / total_players * 100, 1) if total_players > 0 else 0
+                            'count': count,
+                            'percentage': round(count / total_players * 100, 1) if total_players > 0 else 0
                         }
-                        for pos, players in positions.items()
+                        for pos, count in positions.items()
                     }
                 }
                 
@@ -359,12 +349,11 @@ class RecapContentGenerator:
             
             # Save analysis
             output_file = f"{self.content_dir}/position_scarcity_analysis.json"
-            with open(output_file, 'w') as f:
-                json.dump({
-                    'generated_at': datetime.now().isoformat(),
-                    'analysis': scarcity_analysis,
-                    'content': content
-                }, f, indent=2)
+            save_json(output_file, {
+                'generated_at': datetime.now().isoformat(),
+                'analysis': scarcity_analysis,
+                'content': content
+            })
                 
             print("Generated position scarcity analysis")
             return content
@@ -485,20 +474,19 @@ class RecapContentGenerator:
                 week_analysis['adp_vs_performance'].append(player_summary)
                 
             # Sort results
-            week_analysis['top_performers'].sort(key=lambda x: x['fantasy_points'], reverse=True)
-            week_analysis['disappointments'].sort(key=lambda x: x['adp'])
+            week_analysis['top_performers'].sort(key=itemgetter('fantasy_points'), reverse=True)
+            week_analysis['disappointments'].sort(key=itemgetter('adp'))
             
             # Generate content
             content = self.format_weekly_content(week_analysis)
             
             # Save recap
             output_file = f"{self.content_dir}/week_{week}_recap.json"
-            with open(output_file, 'w') as f:
-                json.dump({
-                    'generated_at': datetime.now().isoformat(),
-                    'analysis': week_analysis,
-                    'content': content
-                }, f, indent=2)
+            save_json(output_file, {
+                'generated_at': datetime.now().isoformat(),
+                'analysis': week_analysis,
+                'content': content
+            })
                 
             print(f"Generated Week {week} recap with {len(week_analysis['top_performers'])} top performers")
             return content
@@ -592,8 +580,7 @@ class RecapContentGenerator:
                     
             # Save master content file
             master_file = f"{self.content_dir}/master_content_{datetime.now().strftime('%Y%m%d')}.json"
-            with open(master_file, 'w') as f:
-                json.dump(generated_content, f, indent=2)
+            save_json(master_file, generated_content)
                 
             content_count = len(generated_content['content_types'])
             print(f"Generated {content_count} content types")
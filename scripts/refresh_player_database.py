@@ -8,36 +8,113 @@ import json
 import requests
 import pandas as pd
 from datetime import datetime
+from collections import Counter
 import os
 import sys
+from json_io import FANTASY_POSITIONS, iter_json_items, save_json
 
 class PlayerDatabaseRefresher:
     def __init__(self):
         self.data_dir = "data"
         self.sleeper_api_base = "https://api.sleeper.app/v1"
         self.players_file = f"{self.data_dir}/players.json"
+        self.cache_dir = ".cache/sleeper"
+        self.players_cache_file = f"{self.cache_dir}/players_nfl.json"
+        self.players_cache_validators_file = f"{self.cache_dir}/players_nfl.validators.json"
+        self.total_sleeper_players = 0
         self.ensure_directories()
         
     def ensure_directories(self):
         """Create necessary directories"""
         os.makedirs(self.data_dir, exist_ok=True)
         
+    def load_cached_validators(self):
+        """Build conditional request headers from the cached Sleeper download, if any"""
+        try:
+            if not os.path.exists(self.players_cache_file):
+                return {}
+                
+            with open(self.players_cache_validators_file, 'r') as f:
+                validators = json.load(f)
+                
+            headers = {}
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+            return headers
+            
+        except (OSError, ValueError):
+            return {}
+            
+    def save_players_cache(self, response):
+        """Save the Sleeper download to the cache"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        
+        # Stream to disk in chunks rather than holding the whole body in memory
+        temp_file = f"{self.players_cache_file}.tmp"
+        with open(temp_file, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+        os.replace(temp_file, self.players_cache_file)
+        
+        # Keep the validators for a conditional request next run
+        with open(self.players_cache_validators_file, 'w') as f:
+            json.dump({
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }, f)
+            
+    def is_fantasy_relevant(self, player_data):
+        """Check whether a raw Sleeper player plays or is listed at a fantasy position"""
+        fantasy_pos_list = player_data.get('fantasy_positions') or []
+        if not isinstance(fantasy_pos_list, list):
+            fantasy_pos_list = []
+            
+        return (
+            (player_data.get('position') or '') in FANTASY_POSITIONS or 
+            not FANTASY_POSITIONS.isdisjoint(fantasy_pos_list)
+        )
+        
+    def load_cached_players(self):
+        """Parse the cached Sleeper player database, keeping only fantasy-relevant players"""
+        players_data = {}
+        self.total_sleeper_players = 0
+        
+        # Filter while parsing so the ~10k non-fantasy players are never all held at once
+        for player_id, player_data in iter_json_items(self.players_cache_file):
+            self.total_sleeper_players += 1
+            if isinstance(player_data, dict) and self.is_fantasy_relevant(player_data):
+                players_data[player_id] = player_data
+                
+        return players_data
+            
     def fetch_sleeper_players(self):
-        """Fetch complete player database from Sleeper API"""
+        """Fetch complete player database from Sleeper API, reusing the cached copy if unchanged"""
         try:
             print("Fetching player database from Sleeper API...")
             
             url = f"{self.sleeper_api_base}/players/nfl"
-            response = requests.get(url, timeout=60)
-            response.raise_for_status()
+            headers = self.load_cached_validators()
+            response = requests.get(url, headers=headers, timeout=60, stream=True)
             
-            players_data = response.json()
+            players_data = None
+            if response.status_code == 304:
+                try:
+                    players_data = self.load_cached_players()
+                    print("Sleeper player database unchanged - using cached copy")
+                except Exception as e:
+                    print(f"Cached Sleeper player database unreadable, downloading again: {e}")
+                    response = requests.get(url, timeout=60, stream=True)
+                    
+            if players_data is None:
+                response.raise_for_status()
+                # Stream the body to disk instead of holding the raw bytes and decoded text in memory
+                self.save_players_cache(response)
+                players_data = self.load_cached_players()
             
-            if not isinstance(players_data, dict):
-                print("Invalid response format from Sleeper API")
-                return None
-                
-            print(f"Retrieved {len(players_data)} players from Sleeper")
+            print(f"Retrieved {self.total_sleeper_players} players from Sleeper "
+                  f"({len(players_data)} fantasy-relevant)")
             return players_data
             
         except requests.exceptions.RequestException as e:
@@ -53,31 +130,24 @@ class PlayerDatabaseRefresher:
             print("Cleaning and validating player data...")
             
             cleaned_players = {}
-            fantasy_positions = ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']
+            last_updated = datetime.now().isoformat()
             
             for player_id, player_data in raw_players.items():
                 if not isinstance(player_data, dict):
                     continue
                     
+                # Skip non-fantasy positions
+                if not self.is_fantasy_relevant(player_data):
+                    continue
+                    
                 # Extract relevant fields with None safety
                 position = player_data.get('position') or ''
                 fantasy_pos_list = player_data.get('fantasy_positions') or []
                 
                 # Handle None values in fantasy_positions
-                if fantasy_pos_list is None:
-                    fantasy_pos_list = []
-                elif not isinstance(fantasy_pos_list, list):
+                if not isinstance(fantasy_pos_list, list):
                     fantasy_pos_list = []
                     
-                # Skip non-fantasy positions
-                is_fantasy_relevant = (
-                    position in fantasy_positions or 
-                    any(pos in fantasy_positions for pos in fantasy_pos_list if pos is not None)
-                )
-                
-                if not is_fantasy_relevant:
-                    continue
-                    
                 # Clean player record with safe string handling
                 cleaned_player = {
                     'player_id': player_id,
@@ -103,7 +173,7 @@ class PlayerDatabaseRefresher:
                     'rotowire_id': player_data.get('rotowire_id'),
                     'rotoworld_id': player_data.get('rotoworld_id'),
                     'fantasy_data_id': player_data.get('fantasy_data_id'),
-                    'last_updated': datetime.now().isoformat()
+                    'last_updated': last_updated
                 }
                 
                 # Ensure full_name is populated
@@ -147,27 +217,17 @@ class PlayerDatabaseRefresher:
                 'data_quality_score': 0
             }
             
-            # Analyze data completeness
-            for player_id, player_data in players_data.items():
-                position = player_data.get('position', '')
-                team = player_data.get('team', '')
-                full_name = player_data.get('full_name', '')
-                
-                # Count positions
-                if position:
-                    validation_results['position_counts'][position] = validation_results['position_counts'].get(position, 0) + 1
-                else:
-                    validation_results['missing_data']['no_position'] += 1
-                    
-                # Count teams
-                if team:
-                    validation_results['team_counts'][team] = validation_results['team_counts'].get(team, 0) + 1
-                else:
-                    validation_results['missing_data']['no_team'] += 1
-                    
-                # Check name completeness
-                if not full_name:
-                    validation_results['missing_data']['no_name'] += 1
+            # Analyze data completeness; blank positions/teams are tallied under '' and split out as missing
+            position_counts = Counter(player_data.get('position') or '' for player_data in players_data.values())
+            team_counts = Counter(player_data.get('team') or '' for player_data in players_data.values())
+            
+            validation_results['missing_data']['no_name'] = sum(
+                1 for player_data in players_data.values() if not player_data.get('full_name', '')
+            )
+            validation_results['missing_data']['no_position'] = position_counts.pop('', 0)
+            validation_results['missing_data']['no_team'] = team_counts.pop('', 0)
+            validation_results['position_counts'] = dict(position_counts)
+            validation_results['team_counts'] = dict(team_counts)
                     
             # Calculate quality score
             total_players = validation_results['total_players']
@@ -204,13 +264,11 @@ class PlayerDatabaseRefresher:
             }
             
             # Save main players file (just the players dict for compatibility)
-            with open(self.players_file, 'w') as f:
-                json.dump(players_data, f, indent=2)
+            save_json(self.players_file, players_data)
                 
             # Save detailed database file
             detailed_file = f"{self.data_dir}/player_database_detailed.json"
-            with open(detailed_file, 'w') as f:
-                json.dump(database, f, indent=2)
+            save_json(detailed_file, database)
                 
             print(f"Saved player database: {len(players_data)} players")
             print(f"Main file: {self.players_file}")
@@ -248,6 +306,7 @@ class PlayerDatabaseRefresher:
                     players_by_position[position].append((player_id, player_data))
                     
             # Select top players per position based on status and experience
+            selected_by_position = {}
             for position, players_list in players_by_position.items():
                 # Sort by status (Active first) and years of experience
                 sorted_players = sorted(players_list, key=lambda x: (
@@ -257,26 +316,21 @@ class PlayerDatabaseRefresher:
                 
                 # Take top players for this position
                 limit = position_limits.get(position, 50)
-                for player_id, player_data in sorted_players[:limit]:
-                    fantasy_relevant[player_id] = player_data
+                selected_by_position[position] = dict(sorted_players[:limit])
+                fantasy_relevant.update(selected_by_position[position])
                     
             # Save fantasy-relevant database
             fantasy_file = f"{self.data_dir}/players_fantasy_relevant.json"
-            with open(fantasy_file, 'w') as f:
-                json.dump(fantasy_relevant, f, indent=2)
+            save_json(fantasy_file, fantasy_relevant)
                 
             print(f"Created fantasy-relevant database: {len(fantasy_relevant)} players")
             
-            # Create position-specific files
+            # Create position-specific files from the per-position selections
             for position in position_limits.keys():
-                position_players = {
-                    pid: pdata for pid, pdata in fantasy_relevant.items() 
-                    if pdata.get('position') == position
-                }
+                position_players = selected_by_position.get(position, {})
                 
                 position_file = f"{self.data_dir}/players_{position.lower()}.json"
-                with open(position_file, 'w') as f:
-                    json.dump(position_players, f, indent=2)
+                save_json(position_file, position_players)
                     
                 print(f"Created {position} database: {len(position_players)} players")
                 
@@ -9,7 +9,9 @@ import pandas as pd
 from datetime import datetime, timedelta
 import os
 import sys
+import math
 import statistics
+from json_io import load_json, parse_json, save_json
 
 class WeeklyPerformanceTracker:
     def __init__(self):
@@ -17,6 +19,7 @@ class WeeklyPerformanceTracker:
         self.current_season = 2025
         self.performance_file = f"{self.data_dir}/season_{self.current_season}_performances.json"
         self.weekly_snapshots_file = f"{self.data_dir}/weekly_snapshots.json"
+        self.performance_data = None
         
     def get_current_week(self):
         """Determine current NFL week"""
@@ -39,13 +42,13 @@ class WeeklyPerformanceTracker:
                 print(f"Week {week} stats file not found")
                 return []
                 
-            with open(week_file, 'r') as f:
+            with open(week_file, 'rb') as f:
                 content = f.read().strip()
                 if not content:
                     print(f"Week {week} stats file is empty")
                     return []
                     
-                week_stats = json.loads(content)
+                week_stats = parse_json(content)
                 
             print(f"Loaded {len(week_stats)} player performances for Week {week}")
             return week_stats
@@ -61,10 +64,10 @@ class WeeklyPerformanceTracker:
         """Load existing performance tracking data"""
         try:
             if os.path.exists(self.performance_file):
-                with open(self.performance_file, 'r') as f:
+                with open(self.performance_file, 'rb') as f:
                     content = f.read().strip()
                     if content:
-                        performance_data = json.loads(content)
+                        performance_data = parse_json(content)
                     else:
                         performance_data = {}
                         
@@ -90,8 +93,7 @@ class WeeklyPerformanceTracker:
                 print("Draft database not found - will proceed without ADP integration")
                 return {}
                 
-            with open(draft_file, 'r') as f:
-                draft_data = json.load(f)
+            draft_data = load_json(draft_file)
                 
             players = draft_data.get('players', {})
             print(f"Loaded draft database with {len(players)} players")
@@ -110,7 +112,36 @@ class WeeklyPerformanceTracker:
         except (AttributeError, TypeError):
             return default
             
-    def initialize_player_data(self, player_id, player_name, position, team):
+    def build_draft_index(self, draft_db):
+        """Index draft players by sleeper_id and by (name, team), keeping their order"""
+        by_sleeper_id = {}
+        by_name_team = {}
+        
+        for order, ddata in enumerate(draft_db.values()):
+            by_sleeper_id.setdefault(ddata.get('sleeper_id'), (order, ddata))
+            
+            name_team = ((ddata.get('name') or '').lower(), (ddata.get('team') or '').upper())
+            by_name_team.setdefault(name_team, (order, ddata))
+            
+        return by_sleeper_id, by_name_team
+        
+    def find_draft_player(self, draft_index, player_id, player_name, team):
+        """Find the first draft player matching by sleeper_id or by name and team"""
+        by_sleeper_id, by_name_team = draft_index
+        
+        candidates = [
+            by_sleeper_id.get(player_id),
+            by_name_team.get((player_name.lower(), team.upper()))
+        ]
+        candidates = [candidate for candidate in candidates if candidate]
+        
+        if not candidates:
+            return None
+            
+        # Earliest entry wins, as with a linear scan of the draft database
+        return min(candidates, key=lambda candidate: candidate[0])[1]
+        
+    def initialize_player_data(self, player_id, player_name, position, team, last_updated=None):
         """Initialize player data structure"""
         return {
             'player_name': player_name,
@@ -130,7 +161,7 @@ class WeeklyPerformanceTracker:
                 'consistency_score': 0
             },
             'adp_integration': {},
-            'last_updated': datetime.now().isoformat()
+            'last_updated': last_updated or datetime.now().isoformat()
         }
         
     def update_performance_tracking(self, week=None):
@@ -142,8 +173,7 @@ class WeeklyPerformanceTracker:
             if week == 0:
                 print("No performance data to track in preseason")
                 # Ensure performance file exists
-                with open(self.performance_file, 'w') as f:
-                    json.dump({}, f, indent=2)
+                save_json(self.performance_file, {}, compact=True)
                 return True
                 
             print(f"Updating performance tracking for Week {week}...")
@@ -155,11 +185,18 @@ class WeeklyPerformanceTracker:
             
             if not week_stats:
                 print(f"No Week {week} stats available")
-                # Still ensure file exists
-                with open(self.performance_file, 'w') as f:
-                    json.dump(existing_data, f, indent=2)
+                # Still ensure file exists, but don't rewrite unchanged data that loaded fine
+                if not existing_data or not os.path.exists(self.performance_file):
+                    save_json(self.performance_file, existing_data, compact=True)
                 return True
                 
+            # Index draft players once instead of scanning them for every stat row
+            draft_index = self.build_draft_index(draft_db)
+            
+            # One timestamp for every record touched in this run
+            now_iso = datetime.now().isoformat()
+            week_key = str(week)
+            
             # Process weekly performances
             for player_stat in week_stats:
                 player_id = player_stat.get('player_id') or str(hash(player_stat.get('player_name', '')))
@@ -170,13 +207,14 @@ class WeeklyPerformanceTracker:
                 if not player_name:
                     continue
                     
-                # Initialize player tracking if new
-                if player_id not in existing_data:
-                    existing_data[player_id] = self.initialize_player_data(player_id, player_name, position, team)
+                # Initialize player tracking if new, looking the player up once
+                player_record = existing_data.get(player_id)
+                if player_record is None:
+                    player_record = existing_data[player_id] = self.initialize_player_data(player_id, player_name, position, team, now_iso)
                     
                 # Ensure season_totals exists (fix for the error)
-                if 'season_totals' not in existing_data[player_id]:
-                    existing_data[player_id]['season_totals'] = {
+                if 'season_totals' not in player_record:
+                    player_record['season_totals'] = {
                         'games_played': 0,
                         'total_fantasy_points': 0,
                         'total_fantasy_points_ppr': 0,
@@ -191,16 +229,10 @@ class WeeklyPerformanceTracker:
                     
                 # Add ADP data if available
                 if draft_db:
-                    draft_player = None
-                    for did, ddata in draft_db.items():
-                        if (ddata.get('sleeper_id') == player_id or 
-                            (ddata.get('name', '').lower() == player_name.lower() and 
-                             ddata.get('team', '').upper() == team.upper())):
-                            draft_player = ddata
-                            break
+                    draft_player = self.find_draft_player(draft_index, player_id, player_name, team)
                             
                     if draft_player:
-                        existing_data[player_id]['adp_integration'] = {
+                        player_record['adp_integration'] = {
                             'adp': draft_player.get('adp', 999),
                             'adp_stdev': draft_player.get('adp_stdev', 0),
                             'times_drafted': draft_player.get('times_drafted', 0),
@@ -226,20 +258,20 @@ class WeeklyPerformanceTracker:
                                 player_stat.get('receiving_tds', 0))
                 }
                 
-                existing_data[player_id]['weekly_performances'][str(week)] = week_performance
+                player_record['weekly_performances'][week_key] = week_performance
                 
                 # Update season totals
-                self.update_season_totals(existing_data[player_id], week_performance)
+                self.update_season_totals(player_record, week_performance)
                 
                 # Update last modified
-                existing_data[player_id]['last_updated'] = datetime.now().isoformat()
+                player_record['last_updated'] = now_iso
                 
             # Calculate advanced metrics
             self.calculate_advanced_metrics(existing_data, week)
             
             # Save updated performance data
-            with open(self.performance_file, 'w') as f:
-                json.dump(existing_data, f, indent=2)
+            save_json(self.performance_file, existing_data, compact=True)
+            self.performance_data = existing_data
                 
             print(f"Updated performance tracking for {len(week_stats)} players")
             return True
@@ -248,8 +280,7 @@ class WeeklyPerformanceTracker:
             print(f"Error updating performance tracking: {e}")
             # Ensure file exists even on error
             try:
-                with open(self.performance_file, 'w') as f:
-                    json.dump({}, f, indent=2)
+                save_json(self.performance_file, {}, compact=True)
             except:
                 pass
             return False
@@ -309,9 +340,12 @@ class WeeklyPerformanceTracker:
                 if len(ppr_points) < 1:
                     continue
                     
-                # Calculate consistency metrics
+                # Calculate consistency metrics; stdev is taken in floats around the exact mean because
+                # statistics.stdev converts every value to a fraction and dominates this loop
                 avg_points = statistics.mean(ppr_points)
-                std_dev = statistics.stdev(ppr_points) if len(ppr_points) > 1 else 0
+                std_dev = math.sqrt(
+                    math.fsum((points - avg_points) ** 2 for points in ppr_points) / (len(ppr_points) - 1)
+                ) if len(ppr_points) > 1 else 0
                 consistency_score = max(0, 100 - (std_dev / avg_points * 100)) if avg_points > 0 else 0
                 
                 # Update advanced metrics
@@ -339,8 +373,11 @@ class WeeklyPerformanceTracker:
                 
             print(f"Creating Week {week} performance snapshot...")
             
-            # Load current performance data
-            performance_data = self.load_existing_performance_data()
+            # Reuse the data just saved by update_performance_tracking instead of re-reading it
+            if self.performance_data is not None:
+                performance_data = self.performance_data
+            else:
+                performance_data = self.load_existing_performance_data()
             
             if not performance_data:
                 print("No performance data to snapshot")
@@ -349,10 +386,10 @@ class WeeklyPerformanceTracker:
             # Load existing snapshots
             if os.path.exists(self.weekly_snapshots_file):
                 try:
-                    with open(self.weekly_snapshots_file, 'r') as f:
+                    with open(self.weekly_snapshots_file, 'rb') as f:
                         content = f.read().strip()
                         if content:
-                            snapshots_data = json.loads(content)
+                            snapshots_data = parse_json(content)
                         else:
                             snapshots_data = {'meta': {'season': self.current_season}, 'weekly_snapshots': {}}
                 except:
@@ -384,8 +421,7 @@ class WeeklyPerformanceTracker:
             # Save snapshot
             snapshots_data['weekly_snapshots'][str(week)] = week_snapshot
             
-            with open(self.weekly_snapshots_file, 'w') as f:
-                json.dump(snapshots_data, f, indent=2)
+            save_json(self.weekly_snapshots_file, snapshots_data, compact=True)
                 
             print(f"Created Week {week} snapshot with {len(week_snapshot['players'])} players")
             return True